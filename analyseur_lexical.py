@@ -1,53 +1,78 @@
-from ply import lex
-
 class AnalyseurLexical:
-    # Liste des tokens
-    tokens = ('REGLE', 'NON_TERMINAL', 'TERMINAL', 'PIPE', 'EPSILON')
-
-    # Règles pour les éléments de la grammaire
-    t_REGLE = r':'
-    t_PIPE = r'\|'
-    t_TERMINAL = r'[a-z]'
-    t_EPSILON = r'E'
-
-    # Ignorer les espaces et les tabulations
-    t_ignore = ' \t'
+    # Aucun attribut d'instance : l'analyseur ne conserve aucun état entre deux lignes
+    __slots__ = ()
 
-    def __init__(self):
-        """
-        Initialise l'analyseur lexical.
-        """
-        self.lexer = lex.lex(module=self)
+    # Catégories de caractères utilisées par la table de correspondance
+    ERREUR, IGNORE, REGLE, PIPE, TERMINAL, EPSILON, DEBUT_NON_TERMINAL, CHIFFRE, ESPACE = range(9)
 
-    # Règle modifiée pour les non-terminaux (avec espace facultatif)
-    def t_NON_TERMINAL(self, t):
-        r'[A-DF-Z]\s*[0-9]'
+    # Table de 256 entrées associant chaque octet ASCII à sa catégorie (ERREUR par défaut)
+    table = bytearray(256)
+    for _c in b' \t':
+        table[_c] = IGNORE
+    for _c in b'\n\r\f\v':
+        table[_c] = ESPACE
+    for _c in range(ord('a'), ord('z') + 1):
+        table[_c] = TERMINAL
+    for _c in range(ord('A'), ord('Z') + 1):
+        table[_c] = DEBUT_NON_TERMINAL
+    for _c in range(ord('0'), ord('9') + 1):
+        table[_c] = CHIFFRE
+    table[ord('E')] = EPSILON
+    table[ord(':')] = REGLE
+    table[ord('|')] = PIPE
+    table = bytes(table)
+    del _c
 
-        # Supprimer les espaces dans la valeur du token
-        t.value = t.value.replace(' ', '')
-
-        return t
+    # Les espaces (au sens de \s) peuvent séparer la lettre et le chiffre d'un non-terminal
+    espaces_non_terminal = (IGNORE, ESPACE)
 
     def analyser_texte(self, texte: str) -> list:
         """
         Analyse une ligne de texte représentant une règle.
         :param texte: Du texte.
-        :return: Liste des tokens trouvés.
+        :return: Liste des tokens trouvés, sous forme de tuples (type, valeur).
         :raises ValueError: Si un caractère non reconnu est détecté.
         """
-        self.lexer.input(texte)
+        table = self.table
+        donnees = texte.encode()
+        taille = len(donnees)
         tokens = []
-        while True:
-            token = self.lexer.token()
-            if not token:
-                break
-            tokens.append(token)
+
+        i = 0
+        while i < taille:
+            octet = donnees[i]
+            categorie = table[octet]
+
+            if categorie == self.TERMINAL:
+                tokens.append(('TERMINAL', chr(octet)))
+            elif categorie == self.IGNORE:
+                pass
+            elif categorie == self.DEBUT_NON_TERMINAL:
+                # Non-terminal : une lettre, des espaces facultatifs, puis un chiffre
+                j = i + 1
+                while j < taille and table[donnees[j]] in self.espaces_non_terminal:
+                    j += 1
+                if j == taille or table[donnees[j]] != self.CHIFFRE:
+                    self._erreur(texte, donnees, i)
+                tokens.append(('NON_TERMINAL', chr(octet) + chr(donnees[j])))
+                i = j
+            elif categorie == self.PIPE:
+                tokens.append(('PIPE', '|'))
+            elif categorie == self.REGLE:
+                tokens.append(('REGLE', ':'))
+            elif categorie == self.EPSILON:
+                tokens.append(('EPSILON', 'E'))
+            else:
+                self._erreur(texte, donnees, i)
+            i += 1
 
         return tokens
 
-    def t_error(self, t):
+    @staticmethod
+    def _erreur(texte: str, donnees: bytes, position: int) -> None:
         """
         Gère les erreurs lexicales.
         """
-        raise ValueError(f"Caractère inattendu : «{t.value[0]}» à la position {t.lexpos} dans «{t.lexer.lexdata}»")
-
+        # La position est exprimée en caractères et non en octets
+        position = len(donnees[:position].decode())
+        raise ValueError(f"Caractère inattendu : «{texte[position]}» à la position {position} dans «{texte}»")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+
+from generer import afficher_mots
+from grammaire import charger_grammaire, transformer
+
+
+def main():
+    """
+    Point d'entrée unique : transformation de grammaire et génération de mots
+    dans un seul processus, la grammaire n'étant lue qu'une fois.
+    """
+
+    # Analyse des arguments
+    parser = argparse.ArgumentParser(description="Transformation de grammaire contextuelle et génération de mots.")
+    sous_commandes = parser.add_subparsers(dest="commande", required=True)
+
+    parser_transformer = sous_commandes.add_parser(
+        "transformer", help="Génère les fichiers .chomsky et .greibach de la grammaire."
+    )
+    parser_transformer.add_argument("file", type=str, help="Chemin du fichier contenant la grammaire.")
+    parser_transformer.add_argument(
+        "-n", "--longueur", type=int, default=None,
+        help="Affiche aussi les mots de la grammaire jusqu'à cette longueur."
+    )
+
+    parser_generer = sous_commandes.add_parser("generer", help="Génère les mots d'une longueur donnée.")
+    parser_generer.add_argument("longueur", type=int, help="Longueur des mots à générer.")
+    parser_generer.add_argument("file", type=str, help="Chemin du fichier contenant la grammaire.")
+
+    args = parser.parse_args()
+
+    # 1) Lire la grammaire une seule fois
+    grammaire_obj = charger_grammaire(args.file)
+
+    # 2) Lancer la ou les commandes demandées
+    if args.commande == "transformer":
+        transformer(grammaire_obj, args.file)
+        if args.longueur is not None:
+            afficher_mots(grammaire_obj, args.longueur)
+    else:
+        afficher_mots(grammaire_obj, args.longueur)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,29 @@
 import argparse
+import sys
 
-from grammaire import lire
-import os
+from grammaire import charger_grammaire
+from outil_grammaire import Grammaire
+
+
+def afficher_mots(grammaire_obj: Grammaire, longueur: int) -> None:
+    """
+    Génère et affiche les mots de la grammaire jusqu'à une longueur donnée.
+
+    :param grammaire_obj: Grammaire dont on génère les mots.
+    :param longueur: Longueur maximale des mots générés.
+    """
+    mots = grammaire_obj.generer_mots(longueur)
+
+    if len(mots) == 0:
+        print("Aucun mot reconnu par la grammaire.")
+    else:
+        # Une seule écriture pour tous les mots plutôt qu'un print par mot
+        sys.stdout.write("\n".join(mots) + "\n")
 
 
 def main():
     """
-    Fonction principale pour lancer la transformation de grammaire.
+    Fonction principale pour lancer la génération des mots.
     """
 
     # Analyse des arguments
@@ -15,24 +32,11 @@ def main():
     parser.add_argument("file", type=str, help="Chemin du fichier contenant la grammaire.")
     args = parser.parse_args()
 
-    # Fichier d'entrée
-    fichier = args.file
-    if not os.path.isfile(fichier):
-        print(f"Erreur : Le fichier '{fichier}' n'existe pas.")
-        return
-
     # 1) Lire la grammaire
-    grammaire_obj = lire(fichier)
-
-    # 2) Générer les mots
-    mots = grammaire_obj.generer_mots(args.longueur)
+    grammaire_obj = charger_grammaire(args.file)
 
-    # 3) Afficher les mots
-    if len(mots) == 0:
-        print("Aucun mot reconnu par la grammaire.")
-    else:
-        for mot in mots:
-            print(mot)
+    # 2) Générer et afficher les mots
+    afficher_mots(grammaire_obj, args.longueur)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
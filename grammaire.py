@@ -2,43 +2,66 @@
 # -*- coding: utf-8 -*-
 
 import argparse
-import copy
-import os
+import sys
 
-from outil_grammaire import ecrire, lire
+from outil_grammaire import Grammaire, ecrire, lire
 
 
-def main():
+def charger_grammaire(fichier: str) -> Grammaire:
     """
-    Fonction principale pour lancer la transformation de grammaire.
+    Lit la grammaire d'un fichier, ou quitte le programme si le fichier ne peut pas être lu
+    (inexistant, répertoire, droits insuffisants...).
+
+    :param fichier: Chemin du fichier contenant la grammaire.
+    :return: Objet Grammaire lu depuis le fichier.
     """
+    try:
+        return lire(fichier)
+    except FileNotFoundError:
+        sys.stderr.write(f"Erreur : Le fichier '{fichier}' n'existe pas.\n")
+        sys.exit(1)
+    except OSError as erreur:
+        sys.stderr.write(f"Erreur : Impossible de lire le fichier '{fichier}' ({erreur.strerror}).\n")
+        sys.exit(1)
 
-    # Analyse des arguments
-    parser = argparse.ArgumentParser(description="Transformation de grammaire contextuelle.")
-    parser.add_argument("file", type=str, help="Chemin du fichier contenant la grammaire.")
-    args = parser.parse_args()
 
-    # Fichier d'entrée
-    fichier = args.file
-    if not os.path.isfile(fichier):
-        print(f"Erreur : Le fichier '{fichier}' n'existe pas.")
-        return
+def transformer(grammaire_obj: Grammaire, fichier: str) -> None:
+    """
+    Transforme la grammaire en CNF et en GNF, puis exporte les fichiers .chomsky et .greibach.
 
-    # 1) Lire la grammaire
-    grammaire_obj = lire(fichier)
+    :param grammaire_obj: Grammaire à transformer.
+    :param fichier: Chemin du fichier d'origine, utilisé pour nommer les fichiers exportés.
+    """
 
-    # 2) a. Transformer en CNF
-    cnf = copy.deepcopy(grammaire_obj)
+    # a. Transformer en CNF
+    cnf = grammaire_obj.clone()
     cnf.convertir_en_forme_normale_de_Chomsky()
 
-    # 2) b. Transformer en GNF
-    gbh = copy.deepcopy(grammaire_obj)
+    # b. Transformer en GNF
+    gbh = grammaire_obj.clone()
     gbh.convertir_en_forme_normale_de_Greibach()
 
-    # 3) Exporter
+    # Exporter
     ecrire(cnf, fichier, extension="chomsky")
     ecrire(gbh, fichier, extension="greibach")
 
 
+def main():
+    """
+    Fonction principale pour lancer la transformation de grammaire.
+    """
+
+    # Analyse des arguments
+    parser = argparse.ArgumentParser(description="Transformation de grammaire contextuelle.")
+    parser.add_argument("file", type=str, help="Chemin du fichier contenant la grammaire.")
+    args = parser.parse_args()
+
+    # 1) Lire la grammaire
+    grammaire_obj = charger_grammaire(args.file)
+
+    # 2) Transformer et exporter
+    transformer(grammaire_obj, args.file)
+
+
 if __name__ == "__main__":
     main()
@@ -1,5 +1,5 @@
-import copy
-from functools import lru_cache
+import heapq
+import sys
 from typing import Set
 
 from analyseur_lexical import AnalyseurLexical
@@ -7,15 +7,19 @@ from analyseur_lexical import AnalyseurLexical
 LETTRES = "ABCDFGHIJKLMNOPQRSTUVWXYZ"
 CHIFFRES = "0123456789"
 
+# Tous les noms de non-terminaux possibles, dans l'ordre où ils sont attribués
+NOMS_NON_TERMINAUX = tuple(f"{lettre}{chiffre}" for lettre in LETTRES for chiffre in CHIFFRES)
+
+# Analyseur lexical partagé par tous les appels à lire() (il ne conserve aucun état)
+ANALYSEUR = AnalyseurLexical()
+
 def generer_non_terminal(non_terminaux: Set[str]) -> str:
     """
     Génère un nouveau non-terminal unique.
     """
-    for lettre in LETTRES:
-        for chiffre in CHIFFRES:
-            nouveau = f"{lettre}{chiffre}"
-            if nouveau not in non_terminaux:
-                return nouveau
+    for nouveau in NOMS_NON_TERMINAUX:
+        if nouveau not in non_terminaux:
+            return nouveau
 
     raise RuntimeError("Impossible de générer un nouveau non-terminal.")
 
@@ -26,10 +30,14 @@ class Grammaire:
     Forme Normale de Chomsky (CNF) ou de Greibach (GNF).
     """
 
+    __slots__ = ('regles_de_production', 'non_terminaux', 'axiome', '_curseur_non_terminal')
+
     def __init__(self):
         self.regles_de_production = {}
         self.non_terminaux: Set[str] = set()
         self.axiome: str | None = None
+        # Position dans NOMS_NON_TERMINAUX à partir de laquelle chercher un nom libre
+        self._curseur_non_terminal = 0
 
     # Gestion des axiomes et des règles de production
     def set_axiome(self, axiome: str) -> None:
@@ -46,17 +54,58 @@ class Grammaire:
     def ajouter_regle(self, non_terminal_gauche: str, productions_associees: list) -> None:
         """
         Ajoute une règle de production à la grammaire. Si le non-terminal de gauche n'existe pas encore,
-        il est ajouté à l'ensemble des non-terminaux. Les règles de production sont stockées sous forme de
-        listes de tuples, où chaque tuple représente un symbole (non-terminal ou terminal).
+        il est ajouté à l'ensemble des non-terminaux. Chaque production est stockée sous forme de tuple
+        (immuable et hachable) de symboles, où chaque symbole est lui-même un tuple (type, valeur).
 
         :param non_terminal_gauche: Le non-terminal de gauche de la règle.
         :param productions_associees: Les productions associées à ce non-terminal.
         """
         if non_terminal_gauche not in self.regles_de_production:
             self.regles_de_production[non_terminal_gauche] = []
-        self.regles_de_production[non_terminal_gauche].extend(productions_associees)
+        self.regles_de_production[non_terminal_gauche].extend(map(tuple, productions_associees))
         self.non_terminaux.add(non_terminal_gauche)
 
+    def clone(self) -> "Grammaire":
+        """
+        Crée une copie indépendante de la grammaire, que l'on peut transformer (CNF, GNF) sans
+        modifier l'originale. Les productions étant des tuples immuables,
+        seuls les conteneurs (dictionnaire, listes de productions, ensemble) sont recopiés,
+        ce qui évite le parcours générique de copy.deepcopy.
+
+        :return: Une nouvelle grammaire identique à celle-ci.
+        """
+        copie = Grammaire()
+        copie.regles_de_production = {
+            nt: list(productions)
+            for nt, productions in self.regles_de_production.items()
+        }
+        copie.non_terminaux = set(self.non_terminaux)
+        copie.axiome = self.axiome
+        copie._curseur_non_terminal = self._curseur_non_terminal
+        return copie
+
+    def _nouveau_non_terminal(self) -> str:
+        """
+        Génère un nouveau non-terminal unique et l'ajoute à l'ensemble des non-terminaux.
+        Un curseur mémorise le dernier nom attribué, de sorte que la recherche d'un nom libre
+        ne repart pas de "A0" à chaque appel. Si tous les noms suivant le curseur sont pris,
+        on parcourt de nouveau l'ensemble des noms (certains ont pu être libérés par un nettoyage).
+
+        :return: Le nom du nouveau non-terminal.
+        """
+        curseur = self._curseur_non_terminal
+        while curseur < len(NOMS_NON_TERMINAUX) and NOMS_NON_TERMINAUX[curseur] in self.non_terminaux:
+            curseur += 1
+
+        if curseur < len(NOMS_NON_TERMINAUX):
+            nouveau = NOMS_NON_TERMINAUX[curseur]
+            self._curseur_non_terminal = curseur + 1
+        else:
+            nouveau = generer_non_terminal(self.non_terminaux)
+
+        self.non_terminaux.add(nouveau)
+        return nouveau
+
     # Transformations principales
     def convertir_en_forme_normale_de_Chomsky(self) -> None:
         """
@@ -69,12 +118,16 @@ class Grammaire:
          – UNIT : Remplacement des règles unitaires de type X → Y par leurs expansions.
 
         À la fin, la grammaire respecte les contraintes de la Forme Normale de Chomsky.
+        Les étapes TERM et DEL sont sautées lorsqu'aucune production n'est concernée.
         """
 
         self._introduire_axiome_depart()  # START
-        self._remplacer_terminaux_dans_productions()  # TERM
+        besoin_term, besoin_del = self._etapes_chomsky_necessaires()
+        if besoin_term:
+            self._remplacer_terminaux_dans_productions()  # TERM
         self._binariser_productions()  # BIN
-        self._supprimer_productions_epsilon()  # DEL
+        if besoin_del:
+            self._supprimer_productions_epsilon()  # DEL
         self._eliminer_regles_unitaires()  # UNIT
 
     def convertir_en_forme_normale_de_Greibach(self) -> None:
@@ -100,6 +153,33 @@ class Grammaire:
 
 
     # Méthodes privées pour les transformations en CNF et GNF
+    def _etapes_chomsky_necessaires(self) -> tuple:
+        """
+        Parcourt une seule fois les productions pour savoir si les étapes TERM et DEL
+        de la CNF ont du travail à faire :
+         – TERM n'est utile que si un terminal apparaît dans une production de longueur > 1.
+         – DEL n'est utile que si un EPSILON apparaît dans une production.
+        Les étapes BIN, qui élimine aussi les doublons, et UNIT sont toujours exécutées.
+
+        :return: tuple (besoin_term, besoin_del).
+        """
+        besoin_term = False
+        besoin_del = False
+
+        for productions_associees in self.regles_de_production.values():
+            for production in productions_associees:
+                for (type_symbole, _) in production:
+                    if type_symbole == "EPSILON":
+                        besoin_del = True
+                    elif type_symbole == "TERMINAL" and len(production) > 1:
+                        besoin_term = True
+
+                # Inutile de continuer dès que les deux étapes sont nécessaires
+                if besoin_term and besoin_del:
+                    return besoin_term, besoin_del
+
+        return besoin_term, besoin_del
+
     def _introduire_axiome_depart(self) -> None:
         """
         Introduit un nouvel axiome en ajoutant un non-terminal supplémentaire.
@@ -108,13 +188,12 @@ class Grammaire:
         """
 
         # Générer un nouveau non-terminal qui n'existait pas encore.
-        nouveau_axiome = generer_non_terminal(self.non_terminaux)
-        self.non_terminaux.add(nouveau_axiome)
+        nouveau_axiome = self._nouveau_non_terminal()
 
         # On crée une seule règle : nouveau_axiome -> (NON_TERMINAL, self.axiome).
         # Concrètement, si l'ancien axiome était "S0", on aura : S1 -> S0
         # et self.axiome passera à "S1".
-        self.regles_de_production[nouveau_axiome] = [[('NON_TERMINAL', self.axiome)]]
+        self.regles_de_production[nouveau_axiome] = [(('NON_TERMINAL', self.axiome),)]
 
         # Mettre à jour l'axiome de la grammaire pour qu'il soit ce nouveau symbole.
         self.axiome = nouveau_axiome
@@ -131,73 +210,62 @@ class Grammaire:
         # le même non-terminal pour un même terminal.
         assoc_terminaux = {}
 
-        # Parcourir toutes les règles pour détecter les terminaux uniques
-        # qui produisent directement un non-terminal existant.
+        # Parcourir toutes les règles pour détecter les non-terminaux existants
+        # qui ne produisent qu'un unique terminal (ex: A1 -> a).
         for non_terminal_gauche, productions_associees in self.regles_de_production.items():
-            for production in productions_associees:
+            # Le non-terminal ne peut remplacer le terminal que si c'est sa seule production :
+            # avec C1 -> c | E, remplacer 'c' par C1 ajouterait la chaîne vide au langage.
+            if len(productions_associees) == 1:
+                production = productions_associees[0]
                 # Si la production est de longueur 1, et que c'est un terminal,
                 # alors on enregistre dans le dictionnaire pour pouvoir réutiliser
                 # la même association terminal -> non-terminal.
                 if len(production) == 1 and production[0][0] == "TERMINAL":
                     assoc_terminaux[production[0][1]] = non_terminal_gauche
 
-        # Ce nouveau dictionnaire contiendra la version finale des règles
-        # (sans modifier self.regles_de_production directement pendant la boucle).
-        nouvelles_regles = {}
-
-        # Dictionnaire temporaire pour stocker les règles (ex: T_a -> a)
-        # des nouveaux non-terminaux créés au fil du parcours.
-        regles_intermediaires = {}
+        regles = self.regles_de_production
 
-        # Parcourir sans modifier self.regles_de_production pendant la boucle
-        for non_terminal, productions_associees in self.regles_de_production.items():
-            nouvelles_productions = []
+        # 1) Repérer les non-terminaux dont une production longue contient un terminal, et
+        #    ces terminaux eux-mêmes (dans l'ordre de rencontre, sans doublon).
+        a_reecrire = []
+        terminaux_a_remplacer = {}
+        for non_terminal, productions_associees in regles.items():
+            concerne = False
             for production in productions_associees:
-                # Si la production contient plus d'un symbole,
-                # on remplace les terminaux par des non-terminaux.
                 if len(production) > 1:
-
-                    nouvelle_production = []
                     for (type_symbole, valeur_symbole) in production:
-
                         if type_symbole == "TERMINAL":
-                            # Si ce terminal n'a pas encore été associé à un non-terminal
-                            if valeur_symbole not in assoc_terminaux:
-                                # Générer un nouveau non-terminal
-                                nouveau_nt = generer_non_terminal(self.non_terminaux)
-                                self.non_terminaux.add(nouveau_nt)
-
-                                # Stocker la nouvelle règle dans regles_intermediaires
-                                # Par exemple: T_a -> a
-                                regles_intermediaires[nouveau_nt] = [[("TERMINAL", valeur_symbole)]]
-
-                                # Mémoriser l'association 'a' -> T_a
-                                assoc_terminaux[valeur_symbole] = nouveau_nt
-
-                            # On remplace le terminal par le non-terminal correspondant
-                            nouvelle_production.append(
-                                ("NON_TERMINAL", assoc_terminaux[valeur_symbole])
-                            )
-                        else:
-                            # Sinon, on recopie le symbole tel quel
-                            nouvelle_production.append((type_symbole, valeur_symbole))
-
-                    nouvelles_productions.append(nouvelle_production)
-                else:
-                    # Si la production est de longueur 1, pas besoin de changement
-                    nouvelles_productions.append(production)
+                            terminaux_a_remplacer[valeur_symbole] = None
+                            concerne = True
+            if concerne:
+                a_reecrire.append(non_terminal)
 
-            # Après traitement, on stocke ces productions dans le dictionnaire final
-            nouvelles_regles[non_terminal] = nouvelles_productions
+        # 2) Créer d'un coup un non-terminal pour chaque terminal qui n'en a pas encore
+        #    (ex: T_a -> a), et associer à chaque terminal le symbole qui le remplace.
+        regles_intermediaires = {}
+        for valeur_symbole in terminaux_a_remplacer:
+            if valeur_symbole not in assoc_terminaux:
+                nouveau_nt = self._nouveau_non_terminal()
+                regles_intermediaires[nouveau_nt] = [(("TERMINAL", valeur_symbole),)]
+                assoc_terminaux[valeur_symbole] = nouveau_nt
+        remplacants = {
+            valeur_symbole: ("NON_TERMINAL", assoc_terminaux[valeur_symbole])
+            for valeur_symbole in terminaux_a_remplacer
+        }
+
+        # 3) Réécrire sur place les seules listes concernées : dans les productions de
+        #    plus d'un symbole, chaque terminal est remplacé par son non-terminal.
+        for non_terminal in a_reecrire:
+            regles[non_terminal] = [
+                tuple(
+                    remplacants[symbole[1]] if symbole[0] == "TERMINAL" else symbole
+                    for symbole in production
+                ) if len(production) > 1 else production
+                for production in regles[non_terminal]
+            ]
 
-        # Fusionner regles_intermediaires dans nouvelles_regles
-        # (ajout des nouveaux non-terminaux créés en cours de route).
-        for nouveau_nt, productions_creees in regles_intermediaires.items():
-            nouvelles_regles[nouveau_nt] = productions_creees
-
-        # Mettre à jour self.regles_de_production en une seule fois,
-        # évitant ainsi l'erreur "dictionary changed size during iteration".
-        self.regles_de_production = nouvelles_regles
+        # Ajouter les nouveaux non-terminaux une fois toutes les réécritures faites
+        regles.update(regles_intermediaires)
 
     def _binariser_productions(self) -> None:
         """
@@ -221,99 +289,102 @@ class Grammaire:
         # Parcourir les règles existantes
         for non_terminal, productions_associees in self.regles_de_production.items():
             nouvelles_productions = []
+            # Productions déjà ajoutées : s'il y a S0 -> A1A2
+            # en double, on n'en garde qu'un.
+            deja_vues = set()
             for production in productions_associees:
+                taille = len(production)
                 # Si la production a 2 symboles ou moins, elle respecte déjà
                 # la contrainte binaire et n'a pas besoin d'être transformée.
-                if len(production) <= 2:
-                    nouvelles_productions.append(production)
+                if taille <= 2:
+                    production_binaire = production
+                elif taille == 3:
+                    # Cas le plus fréquent, traité directement : A B C devient A X
+                    # avec X -> B C (X étant réutilisé si le suffixe B C est déjà connu).
+                    suffixe = production[1:]
+                    symbole = cache_regles_binaires.get(suffixe)
+                    if symbole is None:
+                        nouveau_non_terminal = self._nouveau_non_terminal()
+                        symbole = ("NON_TERMINAL", nouveau_non_terminal)
+                        cache_regles_binaires[suffixe] = symbole
+                        nouvelles_regles[nouveau_non_terminal] = [suffixe]
+                    production_binaire = (production[0], symbole)
                 else:
-                    # Sinon, on la binarise à l'aide d'une méthode récursive,
+                    # Sinon, on la binarise à l'aide de _en_binaire,
                     # tout en utilisant un cache pour éviter les duplications.
-                    productions_binaires = self._en_binaire(
+                    production_binaire = self._en_binaire(
                         production, nouvelles_regles, cache_regles_binaires
-                    )
-                    # On ajoute les règles binaires obtenues
-                    nouvelles_productions.extend(productions_binaires)
+                    )[0]
+
+                # On ajoute la règle binaire obtenue, sauf si elle est déjà présente
+                if production_binaire not in deja_vues:
+                    deja_vues.add(production_binaire)
+                    nouvelles_productions.append(production_binaire)
 
             # Après traitement, on assigne ces nouvelles productions
             # au non-terminal courant.
             nouvelles_regles[non_terminal] = nouvelles_productions
 
         # Une fois la boucle terminée, on remplace self.regles_de_production par la version binaire.
+        # Les non-terminaux intermédiaires n'ont qu'une production chacun : pas de doublon possible.
         self.regles_de_production = nouvelles_regles
 
-        # Pour chaque non-terminal, on convertit la liste des productions en un set
-        # (de tuples), puis on la retransforme en liste. Ainsi, s'il y a
-        # S0 -> A1A2 en double, on n'en garde qu'un.
-        for nt, productions in self.regles_de_production.items():
-            # Convertir chaque production (liste) en tuple pour le set
-            ensemble_productions = set(tuple(prod) for prod in productions)
-            # Puis revenir à une liste de listes
-            self.regles_de_production[nt] = [list(tup) for tup in ensemble_productions]
-
     def _en_binaire(self, production, nouvelles_regles, cache_regles_binaires) -> list:
         """
-        Transforme récursivement une production en une suite de règles binaires.
+        Transforme une production en une suite de règles binaires, en parcourant
+        ses suffixes du plus long au plus court (sans récursion).
         Utilise un cache (cache_regles_binaires) pour éviter de recréer plusieurs fois
         les mêmes non-terminaux pour un même suffixe.
 
-        :param production: list, la production à binariser
+        :param production: tuple, la production à binariser
         :param nouvelles_regles: dict, où stocker les éventuelles nouvelles règles
          pour les non-terminaux créés à la volée.
         :param cache_regles_binaires: dict, cache pour réutiliser les règles binaires déjà générées.
-        :return: list, une liste de productions binaires (ex: [[A, X0]]).
+        :return: list, une liste de productions binaires (ex: [(A, X0)]).
         """
 
         # Si la production est déjà binaire ou unaire, on la renvoie telle quelle.
         if len(production) <= 2:
             return [production]
 
-        def convertir_en_tuple_recursive(obj):
-            """
-            Convertit récursivement les listes en tuples, afin que l'objet
-            puisse être utilisé comme clé dans le cache (car hachable).
-            """
-            if isinstance(obj, list):
-                return tuple(convertir_en_tuple_recursive(e) for e in obj)
-            return obj
-
-        # On récupère la partie droite (suffixe) de la production,
-        # puis on la convertit en tuple pour le cache.
-        suffixe = production[1:]
-        suffixe_tuple = convertir_en_tuple_recursive(suffixe)
-
-        # Vérifier si on a déjà binarisé ce suffixe
-        if suffixe_tuple in cache_regles_binaires:
-            # Si oui, on réutilise le non-terminal qui lui était associé
-            non_terminal_existant = cache_regles_binaires[suffixe_tuple]
-            # On retourne directement la règle binaire [premier_symbole, non_terminal_existant]
-            return [[production[0], non_terminal_existant]]
-
-        # Sinon, on crée un nouveau non-terminal pour ce suffixe
-        nouveau_non_terminal = generer_non_terminal(self.non_terminaux)
-        self.non_terminaux.add(nouveau_non_terminal)
-
-        # On enregistre dans le cache l'association suffixe -> ce nouveau non-terminal
-        # sous forme ('NON_TERMINAL', nom).
-        cache_regles_binaires[suffixe_tuple] = ("NON_TERMINAL", nouveau_non_terminal)
-
-        # Construire la règle binaire initiale, par exemple si la production est
-        # [A, B, C, D], on crée [A, (NON_TERMINAL, nouveau_non_terminal)].
-        nouvelle_production = [production[0], ("NON_TERMINAL", nouveau_non_terminal)]
-
-        # Initialiser la liste de règles pour ce nouveau non-terminal (s'il n'existe pas).
-        if nouveau_non_terminal not in nouvelles_regles:
-            nouvelles_regles[nouveau_non_terminal] = []
-
-        # Poursuivre la binarisation sur le 'reste' : B, C, D
-        sous_regles_binaires = self._en_binaire(suffixe, nouvelles_regles, cache_regles_binaires)
+        # Non-terminaux créés pour les suffixes successifs, avec la position de début
+        # de leur suffixe. Par exemple si la production est (A, B, C, D), on crée
+        # X pour (B, C, D) puis Y pour (C, D).
+        chaine = []
+        # Symbole déjà associé (dans le cache) au premier suffixe rencontré qui y figurait
+        suite_existante = None
+
+        for debut in range(1, len(production) - 1):
+            # On récupère le suffixe courant de la production (un tuple, donc hachable),
+            # qui sert de clé dans le cache.
+            suffixe = production[debut:]
+
+            # Si on a déjà binarisé ce suffixe, on réutilise le non-terminal qui lui était
+            # associé : la suite de la chaîne existe déjà.
+            if suffixe in cache_regles_binaires:
+                suite_existante = cache_regles_binaires[suffixe]
+                break
 
-        # On ajoute ces sous-règles binaires aux règles du nouveau non-terminal.
-        # Ainsi, nouveau_non_terminal -> sous_regles_binaires.
-        nouvelles_regles[nouveau_non_terminal].extend(sous_regles_binaires)
+            # Sinon, on crée un nouveau non-terminal pour ce suffixe, et on enregistre
+            # dans le cache l'association suffixe -> ('NON_TERMINAL', nom).
+            nouveau_non_terminal = self._nouveau_non_terminal()
+            symbole = ("NON_TERMINAL", nouveau_non_terminal)
+            cache_regles_binaires[suffixe] = symbole
+            chaine.append((debut, nouveau_non_terminal, symbole))
+
+        # Relier les maillons : chaque non-terminal créé produit le premier symbole de son
+        # suffixe suivi du non-terminal du suffixe suivant (X -> B Y). Le dernier produit
+        # soit le symbole trouvé dans le cache, soit directement son suffixe binaire (Y -> C D).
+        for k, (debut, nouveau_non_terminal, _) in enumerate(chaine):
+            if k + 1 < len(chaine):
+                nouvelles_regles[nouveau_non_terminal] = [(production[debut], chaine[k + 1][2])]
+            elif suite_existante is not None:
+                nouvelles_regles[nouveau_non_terminal] = [(production[debut], suite_existante)]
+            else:
+                nouvelles_regles[nouveau_non_terminal] = [production[debut:]]
 
-        # On renvoie la règle binaire [A, (NON_TERMINAL, nouveau_non_terminal)]
-        return [nouvelle_production]
+        # On renvoie la règle binaire (A, (NON_TERMINAL, X))
+        return [(production[0], chaine[0][2] if chaine else suite_existante)]
 
     def _supprimer_productions_epsilon(self) -> None:
         """
@@ -322,181 +393,183 @@ class Grammaire:
         Combine les productions existantes pour représenter les entités non-nullables.
         """
 
-        # Identifier tous les non-terminaux nullables (pour éviter d'appeler _est_nullable() à chaque fois).
-        ensemble_nullables = {nt for nt in self.non_terminaux if self._est_nullable(nt)}
+        # Identifier une seule fois tous les non-terminaux nullables.
+        ensemble_nullables = self._calculer_nullables()
 
         # Ce nouveau dictionnaire contiendra les règles après élimination d'Epsilon,
         # sans modifier self.regles_de_production directement pendant la boucle.
         nouvelles_regles = {}
 
+        # Cache des combinaisons déjà calculées, indexé par la production.
+        # L'ensemble des nullables étant fixe pendant cette étape, il ne fait pas partie de la clé.
+        cache_combinaisons = {}
+
         # Parcourir chaque non-terminal et ses productions
         for non_terminal_gauche, productions_associees in self.regles_de_production.items():
             nouvelles_productions = []
+            deja_vues = set()  # productions déjà ajoutées
+
+            # Seul l'axiome, s'il est nullable, peut garder une production epsilon
+            epsilon_autorise = non_terminal_gauche == self.axiome and non_terminal_gauche in ensemble_nullables
 
             # Pour chaque production, on génère toutes les combinaisons via la fonction
             # _generer_combinaisons, qui considère les symboles annulables (dans ensemble_nullables).
             for production in productions_associees:
-                combinaisons = self._generer_combinaisons(production, ensemble_nullables)
+                combinaisons = cache_combinaisons.get(production)
+                if combinaisons is None:
+                    combinaisons = self._generer_combinaisons(production, ensemble_nullables)
+                    cache_combinaisons[production] = combinaisons
 
-                # On ne conserve la combinaison vide [] que si 'non_terminal_gauche' est l'axiome et qu'il fait
-                # partie d'ensemble_nullables. Sinon, on ignore la combinaison vide.
                 for c in combinaisons:
-                    if c:
-                        # Combinaison non vide => on la garde
+                    # La combinaison vide [], comme une production epsilon explicite, n'est
+                    # conservée que si 'non_terminal_gauche' est l'axiome et qu'il fait partie
+                    # d'ensemble_nullables. Sinon, on l'ignore.
+                    if not c or (len(c) == 1 and c[0][0] == "EPSILON"):
+                        if not epsilon_autorise:
+                            continue
+                        # On remplace la production vide par (("EPSILON","E"),)
+                        c = (("EPSILON", "E"),)
+
+                    # Retirer les doublons au fur et à mesure
+                    if c not in deja_vues:
+                        deja_vues.add(c)
                         nouvelles_productions.append(c)
-                    else:
-                        # c == [], la combinaison vide
-                        # On l'autorise uniquement si c'est l'axiome et il est nullable
-                        if non_terminal_gauche == self.axiome and non_terminal_gauche in ensemble_nullables:
-                            # On remplace la production vide par [("EPSILON","E")]
-                            nouvelles_productions.append([("EPSILON", "E")])
-
-            # Filtrer dans une seule passe : on supprime les productions
-            # [("EPSILON","E")] si le non-terminal n'est ni l'axiome ni nullable.
-            liste_filtree = []
-            for prod in nouvelles_productions:
-                # Si c'est une production epsilon => on la garde seulement si c'est l'axiome nullable
-                if len(prod) == 1 and prod[0][0] == "EPSILON":
-                    if non_terminal_gauche == self.axiome and non_terminal_gauche in ensemble_nullables:
-                        liste_filtree.append(prod)  # c'est autorisé pour l'axiome
-                    else:
-                        # Sinon, on supprime cette production epsilon
-                        pass
-                else:
-                    # Production non vide => on la conserve
-                    liste_filtree.append(prod)
-
-            # Retirer les doublons éventuels : on convertit la liste en un set de tuples,
-            # puis on revient en liste
-            ensemble_productions_uniques = set(tuple(p) for p in liste_filtree)
-            liste_filtree = [list(tup) for tup in ensemble_productions_uniques]
 
             # On stocke le résultat final pour 'non_terminal_gauche'
-            nouvelles_regles[non_terminal_gauche] = liste_filtree
+            nouvelles_regles[non_terminal_gauche] = nouvelles_productions
 
-        # Mise à jour de self.regles_de_production en une seule fois
+        # Mise à jour de self.regles_de_production en une seule fois.
+        # Pas de nettoyage ici : DEL est toujours suivie de UNIT, qui nettoie la grammaire
+        # à la fin (les productions inutiles qu'elle hérite sont alors retirées d'un coup).
         self.regles_de_production = nouvelles_regles
 
-        # Nettoyage final
-        self.nettoyer_grammaire()
-
     @staticmethod
     def _generer_combinaisons(production, ensemble_nullables) -> list:
         """
         Génère toutes les combinaisons possibles pour une production,
         en tenant compte des symboles annulables.
-        ex: si production = [(NON_TERMINAL, 'A1'), (NON_TERMINAL, 'B1')]
+        ex: si production = ((NON_TERMINAL, 'A1'), (NON_TERMINAL, 'B1'))
         et A1, B1 sont annulables, on peut avoir :
-        [], [(NON_TERMINAL,'A1')], [(NON_TERMINAL,'B1')], [(NON_TERMINAL,'A1'),(NON_TERMINAL,'B1')]
+        (), ((NON_TERMINAL,'A1'),), ((NON_TERMINAL,'B1'),), ((NON_TERMINAL,'A1'),(NON_TERMINAL,'B1'))
 
-        :param production: list, la production à traiter.
+        :param production: tuple, la production à traiter.
         :param ensemble_nullables: set, ensemble des non-terminaux annulables.
         :return: list, une liste de combinaisons possibles pour cette production.
         """
-        combinaisons = [[]]
-
-        for symbole in production:
-            type_symbole, valeur_symbole = symbole
-
-            # Si le symbole est un non-terminal annulable, on peut :
-            # – soit le conserver
-            # – soit l'omettre.
+        # Associer à chaque symbole annulable un bit distinct (0 pour les autres symboles) :
+        # le i-ème symbole annulable correspond au bit i.
+        bits = []
+        nombre_nullables = 0
+        for type_symbole, valeur_symbole in production:
             if (type_symbole == "NON_TERMINAL") and (valeur_symbole in ensemble_nullables):
-                # dupliquer toutes les combinaisons actuelles, en y ajoutant
-                # ou pas ce symbole
-                nouvelle_liste = []
-                for c in combinaisons:
-                    nouvelle_liste.append(c + [symbole])  # conserver
-                for c in combinaisons:
-                    nouvelle_liste.append(c)  # omettre
-                combinaisons = nouvelle_liste
+                bits.append(1 << nombre_nullables)
+                nombre_nullables += 1
             else:
-                # Sinon, on doit toujours le conserver
-                combinaisons = [c + [symbole] for c in combinaisons]
+                bits.append(0)
+
+        # Aucun symbole annulable : la production entière est la seule combinaison
+        if not nombre_nullables:
+            return [production]
+
+        # Chaque masque de 0 à 2^k - 1 désigne les symboles annulables omis (bit à 1) ;
+        # les autres symboles sont toujours conservés. Le masque 0 donne la production entière.
+        combinaisons = []
+        for masque in range(1 << nombre_nullables):
+            combinaisons.append(tuple(symbole for symbole, bit in zip(production, bits) if not masque & bit))
 
         return combinaisons
 
-    @lru_cache(maxsize=None)
-    def _est_nullable(self, non_terminal: str, en_cours=frozenset()) -> bool:
-        """
-        Vérifie récursivement si un non-terminal est nullable.
-        Un non-terminal est nullable si :
-          - Il a une production explicite epsilon ('EPSILON').
-          - Tous les symboles d'une règle sont nullables.
-
-        Gère les cycles pour éviter les récursions infinies.
-        :param non_terminal: Le non-terminal à vérifier.
-        :param en_cours: Ensemble immuable (frozenset) des non-terminaux en cours d'évaluation.
-        :return: True si le non_terminal est nullable, False sinon.
-        """
-        # Si on est déjà en train d'analyser 'non_terminal', on est dans un cycle.
-        # On décide alors de ne pas le considérer comme nullable (pour éviter boucle infinie).
-        if non_terminal in en_cours:
-            return False
-
-        # On ajoute le non-terminal courant à l'ensemble en cours
-        nouveau_en_cours = en_cours | frozenset([non_terminal])
-
-        # Parcourir toutes les productions de non_terminal
-        for production in self.regles_de_production.get(non_terminal, []):
-            # S'il existe une production [("EPSILON","E")], alors c'est nullable
-            if len(production) == 1 and production[0][0] == 'EPSILON':
-                return True
-
-            # Sinon, si tous les symboles d'une production sont des non-terminaux annulables,
-            # alors le non-terminal est nullable.
-            # (ex: A -> B C, B et C étant annulables => A annulable)
-            if all( (sym[0] == 'EPSILON') or
-                    (sym[0] == 'NON_TERMINAL' and self._est_nullable(sym[1], nouveau_en_cours))
-                    for sym in production
-            ):
-                return True
-
-        # Si on n'a trouvé aucune production nullable, on renvoie False
-        return False
+    def _calculer_nullables(self) -> Set[str]:
+        """
+        Calcule l'ensemble des non-terminaux nullables par itération jusqu'à point fixe.
+        Un non-terminal est nullable si l'une de ses productions :
+          - est une production epsilon explicite ('EPSILON'), ou
+          - ne contient que des EPSILON et des non-terminaux déjà reconnus nullables.
+
+        Le calcul part de l'ensemble vide et ajoute des non-terminaux tant que c'est possible,
+        ce qui gère naturellement les cycles (A -> B, B -> A) sans récursion.
+        :return: L'ensemble des non-terminaux nullables.
+        """
+        nullables = set()
+
+        # On itère tant qu'on ajoute de nouveaux non-terminaux
+        modif = True
+        while modif:
+            modif = False
+
+            for non_terminal, productions in self.regles_de_production.items():
+                # Si non_terminal est déjà nullable, pas besoin de revérifier
+                if non_terminal in nullables:
+                    continue
+
+                # (ex: A -> B C, B et C étant annulables => A annulable)
+                for production in productions:
+                    if all((sym[0] == 'EPSILON') or (sym[0] == 'NON_TERMINAL' and sym[1] in nullables)
+                           for sym in production):
+                        nullables.add(non_terminal)
+                        modif = True
+                        break  # plus besoin de vérifier les autres productions
+
+        return nullables
 
     def _eliminer_regles_unitaires(self) -> None:
         """
         Supprime les règles unitaires, c'est-à-dire celles de la forme X -> Y,
         où X et Y sont des non-terminaux. Les règles X -> Y sont remplacées par
         les règles de production associées à Y.
-        """
 
-        # Construire un nouveau dictionnaire de règles
-        nouvelles_regles = {nt: [] for nt in self.regles_de_production}
-
-        # Éliminer les règles unitaires
-        for non_terminal, productions in self.regles_de_production.items():
-            a_visiter = set()  # non-terminaux trouvés via unité
-            productions_finales = []  # productions non-unitaires
+        La fermeture transitive du graphe des règles unitaires est calculée une seule fois :
+        chaque non-terminal reçoit un indice, et l'ensemble des non-terminaux qu'il atteint
+        par des règles unitaires est représenté par un masque de bits (un entier).
+        """
 
-            # Séparer les règles unitaires (X->Y) des autres
-            for production in productions:
-                # production est une liste comme [(type, val)]
+        non_terminaux = list(self.regles_de_production)
+        indices = {nt: i for i, nt in enumerate(non_terminaux)}
+
+        # Séparer, pour chaque non-terminal, les règles unitaires (X->Y) des autres
+        unitaires = []  # unitaires[i] : masque des non-terminaux Y tels que X_i -> Y
+        non_unitaires = []  # non_unitaires[i] : productions non-unitaires de X_i
+        for non_terminal in non_terminaux:
+            masque = 0
+            productions_finales = []
+            for production in self.regles_de_production[non_terminal]:
+                # production est un tuple comme ((type, val),)
                 if len(production) == 1 and production[0][0] == 'NON_TERMINAL':
-                    # c'est une règle unitaire X->Y
-                    a_visiter.add(production[0][1])
+                    # c'est une règle unitaire X->Y (on ignore les Y sans règles)
+                    if production[0][1] in indices:
+                        masque |= 1 << indices[production[0][1]]
                 else:
                     # on conserve les règles non-unitaires
                     productions_finales.append(production)
+            unitaires.append(masque)
+            non_unitaires.append(productions_finales)
+
+        # Fermeture transitive (algorithme de Warshall sur les masques) : pour chaque
+        # non-terminal intermédiaire k, tout masque qui contient k reçoit celui de k.
+        # Chaque ligne est traitée d'un seul bloc grâce aux opérations sur les entiers.
+        for k, masque_k in enumerate(unitaires):
+            if not masque_k:
+                continue
+            bit_k = 1 << k
+            for i, masque in enumerate(unitaires):
+                if masque & bit_k:
+                    unitaires[i] = masque | masque_k
 
-            # Explorer
-            pile = list(a_visiter)
-            while pile:
-                courant = pile.pop()
-                if courant in self.regles_de_production:
-                    # On parcourt les productions de 'courant'
-                    for p2 in self.regles_de_production[courant]:
-                        # Si p2 est encore unitaire, on continue la chaîne
-                        if len(p2) == 1 and p2[0][0] == 'NON_TERMINAL':
-                            cible = p2[0][1]
-                            if cible not in a_visiter:
-                                a_visiter.add(cible)
-                                pile.append(cible)
-                        else:
-                            # Sinon, c'est une production finale
-                            if p2 not in productions_finales:
-                                productions_finales.append(p2)
+        # Construire un nouveau dictionnaire de règles : les productions non-unitaires de X,
+        # puis celles de chaque Y atteint par des règles unitaires.
+        nouvelles_regles = {}
+        for i, non_terminal in enumerate(non_terminaux):
+            productions_finales = list(non_unitaires[i])
+            # Ensemble des productions déjà ajoutées, pour un test d'appartenance en O(1)
+            deja_vues = set(productions_finales)
+            reste = unitaires[i]
+            while reste:
+                bit = reste & -reste
+                for p2 in non_unitaires[bit.bit_length() - 1]:
+                    if p2 not in deja_vues:
+                        deja_vues.add(p2)
+                        productions_finales.append(p2)
+                reste ^= bit
 
             # Mettre à jour les règles pour non_terminal
             nouvelles_regles[non_terminal] = productions_finales
@@ -512,48 +585,68 @@ class Grammaire:
         Pour chaque production X -> Y α (avec Y un NON_TERMINAL), on remplace
         cette production par X -> (toute production de Y) α.
         On réitère jusqu'à ce qu'aucune production ne commence plus par un non-terminal.
+        Les productions développées de chaque non-terminal sont mémorisées, afin que
+        chaque non-terminal ne soit développé qu'une seule fois quel que soit le nombre
+        de productions qui commencent par lui.
+
+        :raises ValueError: Si un cycle de non-terminaux en tête subsiste (récursivité gauche
+         non éliminée au préalable).
         """
-        modif = True
-        while modif:
-            modif = False
-            nouvelles_regles = {}
-
-            # On parcourt toutes les règles
-            for nt, liste_productions in self.regles_de_production.items():
-                nouvelles_productions_nt = []
-                for prod in liste_productions:
-                    if not prod:
-                        # Production vide (éventuellement EPSILON explicite) => on recopie tel quel
-                        nouvelles_productions_nt.append(prod)
-                        continue
 
-                    premier_type, premier_val = prod[0]
+        regles = self.regles_de_production
 
-                    # Cas 1 : le premier symbole est déjà un TERMINAL ou un EPSILON
-                    if premier_type in ("TERMINAL", "EPSILON"):
-                        nouvelles_productions_nt.append(prod)  # on ne touche pas
-                        continue
+        # Cache : non-terminal -> ses productions ne commençant plus par un non-terminal
+        productions_developpees = {}
 
-                    # Cas 2 : le premier symbole est un NON_TERMINAL => expansion
-                    # On va remplacer X -> Y α par X -> (p1) α, X -> (p2) α, ... pour chaque p_i de Y
-                    if premier_type == "NON_TERMINAL":
-                        y = premier_val  # y = le non-terminal Y
-                        # On va chercher les productions de Y
-                        prods_y = self.regles_de_production.get(y, [])
-                        # Pour chacune de ces productions, on crée X -> p_i + reste(α)
-                        for p_y in prods_y:
-                            # p_y est une liste de symboles
-                            nouvelles_productions_nt.append(p_y + prod[1:])
-                        modif = True
-                    else:
-                        # Autres cas inattendus -> on recopie
-                        nouvelles_productions_nt.append(prod)
+        def developper(nt, en_cours):
+            """
+            Renvoie les productions de nt dont le non-terminal de tête a été
+            récursivement remplacé par ses propres productions développées.
 
-                # On affecte le résultat
-                nouvelles_regles[nt] = nouvelles_productions_nt
+            :param nt: Le non-terminal à développer.
+            :param en_cours: Ensemble des non-terminaux en cours de développement (nt inclus).
+            :return: list, les productions développées de nt.
+            """
+            if nt in productions_developpees:
+                return productions_developpees[nt]
+
+            # Les développements peuvent produire plusieurs fois la même production :
+            # on n'ajoute à resultat que les productions pas encore vues.
+            resultat = []
+            deja_vues = set()
+            for prod in regles.get(nt, ()):
+                # Production vide, ou commençant par un TERMINAL ou un EPSILON => on ne touche pas
+                if not prod or prod[0][0] != "NON_TERMINAL":
+                    if prod not in deja_vues:
+                        deja_vues.add(prod)
+                        resultat.append(prod)
+                    continue
+
+                y = prod[0][1]  # y = le non-terminal Y
+                if y in en_cours:
+                    # Récursivité gauche résiduelle : la développer ne terminerait jamais, et la
+                    # recopier telle quelle donnerait une grammaire qui n'est pas en GNF.
+                    raise ValueError(
+                        f"Récursivité gauche résiduelle : {nt} -> {y}... forme un cycle "
+                        f"de non-terminaux en tête, impossible de mettre la grammaire en GNF."
+                    )
+
+                # On remplace X -> Y α par X -> (p1) α, X -> (p2) α, ... pour chaque p_i développée de Y
+                # (la suite α n'est extraite qu'une fois pour toutes les productions de Y)
+                alpha = prod[1:]
+                for p_y in developper(y, en_cours | {y}):
+                    nouvelle = p_y + alpha
+                    if nouvelle not in deja_vues:
+                        deja_vues.add(nouvelle)
+                        resultat.append(nouvelle)
 
-            # Mise à jour globale
-            self.regles_de_production = nouvelles_regles
+            productions_developpees[nt] = resultat
+            return resultat
+
+        # Mise à jour globale
+        self.regles_de_production = {
+            nt: developper(nt, {nt}) for nt in regles
+        }
 
         # Nettoyage final éventuel : on supprime les non-productifs, inaccessibles, etc.
         self.nettoyer_grammaire()
@@ -570,8 +663,11 @@ class Grammaire:
         On réitère pour toute la grammaire.
         """
 
-        # Dictionnaire pour réutiliser les non-terminaux déjà créés pour chaque terminal
-        assoc_term = {}
+        # Pour réutiliser les non-terminaux déjà créés pour chaque terminal : terminal ->
+        # symbole ("NON_TERMINAL", T_x) qui le remplace, créé une seule fois
+        symboles_remplacement = {}
+        # Règles des non-terminaux créés (ex: T_b -> b)
+        regles_terminaux = {}
         # Nouveau dictionnaire pour stocker la version transformée des règles
         nouvelles_regles = {}
 
@@ -588,37 +684,33 @@ class Grammaire:
                 nouvelle_prod = [production[0]]  # On garde le 1er symbole tel quel
 
                 # Pour tous les symboles suivants, s'ils sont TERMINAL, on remplace
-                for (sym_type, sym_val) in production[1:]:
-                    if sym_type == "TERMINAL":
+                for symbole in production[1:]:
+                    if symbole[0] == "TERMINAL":
+                        sym_val = symbole[1]
                         # Si on n'a pas encore de NT pour ce terminal, on le crée
-                        if sym_val not in assoc_term:
+                        if sym_val not in symboles_remplacement:
                             # Générer un nouveau non-terminal
-                            nouveau_nt = generer_non_terminal(self.non_terminaux)
-                            self.non_terminaux.add(nouveau_nt)
+                            nouveau_nt = self._nouveau_non_terminal()
 
-                            # Stocker la règle associée dans le dictionnaire
-                            assoc_term[sym_val] = nouveau_nt
+                            # Stocker le symbole qui le représente (partagé par toutes les productions)
+                            symboles_remplacement[sym_val] = ("NON_TERMINAL", nouveau_nt)
+                            # Sa règle "nouveau_nt -> terminal" est créée une fois pour toutes
+                            regles_terminaux[nouveau_nt] = [(("TERMINAL", sym_val),)]
 
-                        # Récupérer le non-terminal associé
-                        nt_remplacement = assoc_term[sym_val]
-                        nouvelle_prod.append(("NON_TERMINAL", nt_remplacement))
+                        # Récupérer le symbole du non-terminal associé
+                        nouvelle_prod.append(symboles_remplacement[sym_val])
                     else:
-                        # Sinon (NON_TERMINAL ou EPSILON), on recopie
-                        nouvelle_prod.append((sym_type, sym_val))
+                        # Sinon (NON_TERMINAL ou EPSILON), on recopie le symbole lui-même
+                        nouvelle_prod.append(symbole)
 
-                nouvelles_productions.append(nouvelle_prod)
+                nouvelles_productions.append(tuple(nouvelle_prod))
 
             # On stocke ces nouvelles productions dans le dict final
             nouvelles_regles[nt] = nouvelles_productions
 
-        for terminal, nouveau_nt in assoc_term.items():
-            # On déclare la règle "nouveau_nt -> terminal" dans `nouvelles_regles`
-            # si elle n'existe pas déjà.
-            if nouveau_nt not in nouvelles_regles:
-                nouvelles_regles[nouveau_nt] = [[("TERMINAL", terminal)]]
-            else:
-                if [("TERMINAL", terminal)] not in nouvelles_regles[nouveau_nt]:
-                    nouvelles_regles[nouveau_nt].append([("TERMINAL", terminal)])
+        # Les règles "nouveau_nt -> terminal" viennent après celles des non-terminaux
+        # existants. Chaque nouveau_nt est un nom neuf : sa règle est unique.
+        nouvelles_regles.update(regles_terminaux)
 
         self.regles_de_production = nouvelles_regles
 
@@ -636,61 +728,91 @@ class Grammaire:
         A' -> alpha A' | ε
         """
 
-        while True:
-            ancienne_regles = copy.deepcopy(self.regles_de_production)
+        # Les remplacements modifient les entrées du dictionnaire sans le remplacer
+        regles = self.regles_de_production
 
-            # Récupérer la liste de non-terminaux dans l'ordre (axiome en premier)
-            ordered_nt = [self.axiome] + sorted(self.non_terminaux - {self.axiome})
+        # Récupérer la liste de non-terminaux dans l'ordre (axiome en premier),
+        # ainsi que le rang de chacun dans cet ordre
+        ordered_nt = [self.axiome] + sorted(self.non_terminaux - {self.axiome})
+        rangs = {nt: i for i, nt in enumerate(ordered_nt)}
 
-            # Parcourir i de 0..(len(ordered_nt)-1)
-            for i in range(len(ordered_nt)):
-                ai = ordered_nt[i]
-                # Si ai n'est plus présent (éventuellement supprimé ou vide), on saute
-                if ai not in self.regles_de_production:
-                    continue
-
-                # Pour j=0..(i-1) => élimination de la récursivité gauche indirecte
-                for j in range(i):
-                    aj = ordered_nt[j]
-                    if aj not in self.regles_de_production:
-                        continue
-                    # remplacer ai->aj gamma par ai->(prod_de_Aj) gamma
-                    self._remplacer_productions(ai, aj)
+        # Parcourir i de 0..(len(ordered_nt)-1)
+        for i, ai in enumerate(ordered_nt):
+            # Si ai n'est plus présent (éventuellement supprimé ou vide), on saute
+            if ai not in regles:
+                continue
 
-                # Éliminer la récursivité gauche directe restante sur ai
-                self._supprimer_recursivite_directe(ai)
+            # Élimination de la récursivité gauche indirecte : remplacer ai->aj gamma
+            # par ai->(prod_de_Aj) gamma pour les aj de rang j < i
+            self._remplacer_productions(ai, ordered_nt, rangs)
 
-            if ancienne_regles == self.regles_de_production:
-                break
+            # Éliminer la récursivité gauche directe restante sur ai
+            self._supprimer_recursivite_directe(ai)
 
-    def _remplacer_productions(self, Ai, Aj) -> None:
+    def _remplacer_productions(self, Ai, ordered_nt, rangs) -> None:
         """
-        Remplace dans Ai toute production de la forme Ai->Aj gamma
-        par Ai->(p) gamma pour chaque p dans les productions de Aj.
+        Remplace dans Ai toute production de la forme Ai->Aj gamma, où Aj précède Ai
+        dans l'ordre, par Ai->(p) gamma pour chaque p dans les productions de Aj.
         Ex: Ai->Aj X  => Ai-> (delta1 X | delta2 X | ... ) si Aj->delta1|delta2|...
 
+        Les Aj sont traités par rang croissant. Les productions de Ai sont rangées une
+        seule fois par non-terminal de tête : chaque remplacement ne touche que les
+        productions qui commencent par Aj, sans reparcourir toutes celles de Ai.
+
         :param Ai: Le non-terminal à traiter.
-        :param Aj: Le non-terminal à remplacer.
+        :param ordered_nt: Liste des non-terminaux dans l'ordre de traitement.
+        :param rangs: dict, rang de chaque non-terminal dans ordered_nt.
         """
-        if Ai not in self.regles_de_production or Aj not in self.regles_de_production:
+        regles = self.regles_de_production
+        rang_ai = rangs[Ai]
+
+        # Copie de travail : une production remplacée y est marquée None, les nouvelles
+        # sont ajoutées à la fin (l'ordre final est ainsi celui d'un remplacement direct).
+        productions = list(regles[Ai])
+        # Rang de Aj -> indices des productions de Ai qui commencent par Aj
+        par_tete = {}
+        # Tas des rangs des têtes restant à remplacer
+        a_traiter = []
+
+        def ranger(indice, prod, rang_minimum):
+            # Seules les têtes de rang compris entre rang_minimum et rang_ai sont à remplacer
+            if prod and prod[0][0] == "NON_TERMINAL":
+                rang = rangs.get(prod[0][1])
+                if rang is not None and rang_minimum < rang < rang_ai:
+                    if rang not in par_tete:
+                        par_tete[rang] = []
+                        heapq.heappush(a_traiter, rang)
+                    par_tete[rang].append(indice)
+
+        for indice, prod in enumerate(productions):
+            ranger(indice, prod, -1)
+
+        # S'il n'y a aucune tête à remplacer, les productions de Ai restent inchangées
+        if not a_traiter:
             return
 
-        anciennes = self.regles_de_production[Ai]
-        nouvelles = []
-        regles_aj = self.regles_de_production[Aj]
-
-        for prod in anciennes:
-            # prod est ex: [(NON_TERMINAL, 'Aj'), (TERMINAL, 'a'), ...]
-            if len(prod) >= 1 and prod[0][0] == "NON_TERMINAL" and prod[0][1] == Aj:
-                # => Ai->Aj + gamma
-                gamma = prod[1:]  # la suite
-                # Pour chaque production de Aj, on fabrique Aj_prod + gamma
-                for pAj in regles_aj:
-                    nouvelles.append(pAj + gamma)
-            else:
-                nouvelles.append(prod)
+        while a_traiter:
+            rang = heapq.heappop(a_traiter)
+            indices = par_tete.pop(rang)
+            Aj = ordered_nt[rang]
+            if Aj not in regles:
+                continue
+
+            # Retirer les productions Ai->Aj gamma, dont on garde la suite gamma
+            gammas = []
+            for indice in indices:
+                gammas.append(productions[indice][1:])
+                productions[indice] = None
 
-        self.regles_de_production[Ai] = nouvelles
+            # Pour chaque production de Aj, on fabrique Aj_prod + gamma ; sa nouvelle
+            # tête n'est à remplacer que si elle vient après Aj dans l'ordre.
+            for pAj in regles[Aj]:
+                for gamma in gammas:
+                    nouvelle = pAj + gamma
+                    ranger(len(productions), nouvelle, rang)
+                    productions.append(nouvelle)
+
+        regles[Ai] = [prod for prod in productions if prod is not None]
 
     def _supprimer_recursivite_directe(self, Ai) -> None:
         """
@@ -706,42 +828,37 @@ class Grammaire:
             return
 
         productions = self.regles_de_production[Ai]
-        alphas = []
-        betas = []
-
-        # Détecter les productions directes du type Ai->Ai ...
-        for prod in productions:
-            if len(prod) > 0 and prod[0][0] == "NON_TERMINAL" and prod[0][1] == Ai:
-                # Ai->Ai alpha
-                alphas.append(prod[1:])
-            else:
-                betas.append(prod)
+        # Symbole de tête des productions directement récursives Ai->Ai alpha
+        tete_ai = ("NON_TERMINAL", Ai)
 
         # S'il n'y a pas de récursivité gauche directe => on ne fait rien
-        if not alphas:
+        if not any(prod and prod[0] == tete_ai for prod in productions):
             return
 
-        # Sinon, on crée un nouveau non-terminal Ai'
-        new_nt = generer_non_terminal(self.non_terminaux)
-        self.non_terminaux.add(new_nt)
+        # Sinon, on crée un nouveau non-terminal Ai' et la suite (Ai',) ajoutée
+        # en fin de production, construite une seule fois
+        new_nt = self._nouveau_non_terminal()
+        suite_new_nt = (("NON_TERMINAL", new_nt),)
 
-        # Ai -> beta new_nt  pour chaque beta
+        # Un seul parcours des productions :
+        #   Ai -> beta new_nt  pour chaque beta
+        #   Ai'-> alpha new_nt pour chaque Ai->Ai alpha
         nouvelles_prod_ai = []
-        if not betas:
+        nouvelles_prod_aiprime = []
+        for prod in productions:
+            if prod and prod[0] == tete_ai:
+                nouvelles_prod_aiprime.append(prod[1:] + suite_new_nt)
+            else:
+                nouvelles_prod_ai.append(prod + suite_new_nt)
+
+        if not nouvelles_prod_ai:
             # S’il n'y a pas de beta, on fait ex: Ai->Ai' (ou Ai->EPSILON??)
             # selon la convention (ex. algo standard => Ai-> Ai')
             # ou si on veut se rapprocher de la GN: Ai->Ai'
-            nouvelles_prod_ai.append([("NON_TERMINAL", new_nt)])
-        else:
-            for beta in betas:
-                nouvelles_prod_ai.append(beta + [("NON_TERMINAL", new_nt)])
+            nouvelles_prod_ai.append(suite_new_nt)
 
-        # Ai'-> alpha new_nt pour chaque alpha + EPSILON
-        nouvelles_prod_aiprime = []
-        for alpha in alphas:
-            nouvelles_prod_aiprime.append(alpha + [("NON_TERMINAL", new_nt)])
-        # Ajouter EPSILON
-        nouvelles_prod_aiprime.append([("EPSILON", "E")])
+        # Ajouter EPSILON à Ai'
+        nouvelles_prod_aiprime.append((("EPSILON", "E"),))
 
         # On réassigne
         self.regles_de_production[Ai] = nouvelles_prod_ai
@@ -752,113 +869,93 @@ class Grammaire:
         """
         Nettoie la grammaire en supprimant les non-terminaux inutiles.
         Les non-terminaux inutiles sont ceux qui ne peuvent pas générer de terminaux.
-        """
-        self.supprimer_non_terminaux_vides()
-        self.supprimer_non_productifs()
-        self.supprimer_non_terminaux_inaccessibles()
+        Un non-terminal sans production n'est jamais productif : il est retiré avec les
+        non-productifs, sans passe dédiée.
 
-    def supprimer_non_terminaux_vides(self) -> None:
-        """
-        Supprime de la grammaire tous les non-terminaux sans aucune production associée.
-        Ces non-terminaux ne contribuent en rien et peuvent être nettoyés.
+        Les deux filtres (non-productifs puis inaccessibles) sont appliqués en une seule
+        reconstruction du dictionnaire : l'accessibilité est calculée directement en ne
+        suivant que les productions productives.
         """
-        a_supprimer = [nt for nt, productions in self.regles_de_production.items() if not productions]
+        regles = self.regles_de_production
+        productifs, restants = self._calculer_productifs()
 
-        # Retirer ces non-terminaux vides
-        for nt_vide in a_supprimer:
-            del self.regles_de_production[nt_vide]
-            if nt_vide in self.non_terminaux:
-                self.non_terminaux.remove(nt_vide)
+        # Indice de la première production de chaque non-terminal dans 'restants'
+        debuts = {}
+        indice = 0
+        for nt, liste_prods in regles.items():
+            debuts[nt] = indice
+            indice += len(liste_prods)
 
-    def supprimer_non_terminaux_inaccessibles(self) -> None:
-        """
-        Identifie et supprime les non-terminaux inaccessibles à partir de l'axiome.
-        Ces non-terminaux ne peuvent pas être atteints par un chemin à partir de l'axiome.
-        """
+        # Accessibilité depuis l'axiome, en ne suivant que les productions conservées
         accessibles = set()
-        pile = [self.axiome]
-
-        while pile:
-            courant = pile.pop()
-            if courant not in accessibles:
-                accessibles.add(courant)
-                # On explore ses productions
-                pile.extend(
-                    val for prod in self.regles_de_production.get(courant, [])
-                    for (typ, val) in prod if typ == "NON_TERMINAL"
-                )
-
-        # On ne conserve que ceux dans 'accessibles'
-        regles_filtrees = {}
-        for nt in self.regles_de_production:
-            if nt in accessibles:
-                regles_filtrees[nt] = self.regles_de_production[nt]
-
-        # Diff pour voir lesquels ont été supprimés
-        self.regles_de_production = regles_filtrees
-        self.non_terminaux = set(regles_filtrees.keys())
-
-    def supprimer_non_productifs(self) -> None:
+        if self.axiome in productifs:
+            accessibles.add(self.axiome)
+            pile = [self.axiome]
+            while pile:
+                courant = pile.pop()
+                for i, prod in enumerate(regles[courant], debuts[courant]):
+                    if restants[i] > 0:
+                        continue
+                    for (typ, val) in prod:
+                        if typ == "NON_TERMINAL" and val not in accessibles:
+                            accessibles.add(val)
+                            pile.append(val)
+
+        self.regles_de_production = {
+            nt: [prod for i, prod in enumerate(liste_prods, debuts[nt]) if restants[i] == 0]
+            for nt, liste_prods in regles.items() if nt in accessibles
+        }
+        # Les clés des règles font toujours partie de non_terminaux : on retire sur place
+        # ceux qui n'ont pas été conservés, sans reconstruire l'ensemble.
+        self.non_terminaux.intersection_update(self.regles_de_production)
+
+    def _calculer_productifs(self) -> tuple:
         """
-        Supprime de la grammaire tous les non-terminaux non-productifs,
-        c'est-à-dire ceux qui ne mènent à aucun terminal ou chaîne utile.
+        Calcule les non-terminaux productifs par propagation (liste de travail).
 
-        Exemple d'inutilité :
-        A -> B (si B ne génère aucun terminal), alors A est également non-productif.
+        :return: tuple (productifs, restants) : l'ensemble des non-terminaux productifs, et
+         pour chaque production (numérotée dans l'ordre de parcours des règles) le nombre
+         d'occurrences de non-terminaux non productifs qu'elle contient. Ce nombre n'est jamais
+         négatif : une production est productive, et donc conservée, s'il vaut 0.
         """
-
+        regles = self.regles_de_production
         productifs = set()
-        # On va itérer tant qu'on ajoute de nouveaux symboles
-        modif = True
-        while modif:
-            modif = False
-
-            for nt, liste_prods in self.regles_de_production.items():
-                # Si nt est déjà productif, pas besoin de revérifier
-                if nt in productifs:
-                    continue
-
-                # Vérifier si au moins une production de nt est 100% 'terminal'
-                # ou 'non-terminal déjà dans productifs'
-                for production in liste_prods:
-                    # Si tous les symboles de la production sont :
-                    #   - TERMINAL, ou
-                    #   - NON_TERMINAL appartenant à productifs
-                    # alors cette prod est "productrice".
-                    est_productrice = True
-                    for (typ, val) in production:
-                        if typ == "NON_TERMINAL" and val not in productifs:
-                            est_productrice = False
-                            break
-                        elif typ not in ("TERMINAL", "EPSILON", "NON_TERMINAL"):
-                            # Cas inhabituel, selon votre logique...
-                            est_productrice = False
-                            break
-                        elif typ == "NON_TERMINAL":
-                            # On a déjà vérifié val in productifs
-                            pass
-                        # typ == "TERMINAL" ou "EPSILON" => c'est bon
-                    if est_productrice:
-                        productifs.add(nt)
-                        modif = True
-                        break  # plus besoin de checker les autres prods de nt
-
-        # On enlève de la grammaire ceux qui ne sont pas dans productifs :
-        non_productifs = set(self.regles_de_production.keys()) - productifs
-        for np in non_productifs:
-            del self.regles_de_production[np]
-            if np in self.non_terminaux:
-                self.non_terminaux.remove(np)
-
-        # Enlever aussi, dans toutes les productions, les références
-        # à des non-productifs qui traîneraient.
-        for nt, liste_prods in self.regles_de_production.items():
-
-            # On conserve les productions qui ne contiennent pas de non-productifs
-            self.regles_de_production[nt] = [
-                prod for prod in liste_prods
-                if not any((typ == "NON_TERMINAL" and val in non_productifs) for (typ, val) in prod)
-            ]
+        # Pour chaque production : le non-terminal gauche et le nombre d'occurrences
+        # de non-terminaux pas encore reconnus productifs
+        tetes = []
+        restants = []
+        # Index inverse : non-terminal -> indices des productions où il apparaît
+        occurrences = {}
+        a_traiter = []
+
+        for nt, liste_prods in regles.items():
+            for production in liste_prods:
+                indice = len(tetes)
+                tetes.append(nt)
+                compte = 0
+                for (typ, val) in production:
+                    if typ == "NON_TERMINAL":
+                        compte += 1
+                        occurrences.setdefault(val, []).append(indice)
+                restants.append(compte)
+                # Une production sans non-terminal est directement productrice
+                if compte == 0 and nt not in productifs:
+                    productifs.add(nt)
+                    a_traiter.append(nt)
+
+        # Propagation : chaque non-terminal devenu productif n'est examiné qu'une fois,
+        # et seules les productions qui le contiennent sont mises à jour.
+        while a_traiter:
+            courant = a_traiter.pop()
+            for indice in occurrences.get(courant, ()):
+                restants[indice] -= 1
+                if restants[indice] == 0:
+                    tete = tetes[indice]
+                    if tete not in productifs:
+                        productifs.add(tete)
+                        a_traiter.append(tete)
+
+        return productifs, restants
 
     def generer_mots(self, longueur: int) -> list:
         """
@@ -872,47 +969,94 @@ class Grammaire:
         if self.axiome is None:
             return []
 
-        mots_generes = set()
+        regles = self.regles_de_production
+
+        # Longueur minimale des mots dérivables depuis chaque non-terminal (point fixe
+        # à la Bellman-Ford : un terminal compte pour 1, EPSILON pour 0).
+        infini = float("inf")
+        longueur_min = dict.fromkeys(regles, infini)
+
+        def minimum(symboles):
+            return sum(
+                1 if typ == "TERMINAL" else longueur_min.get(val, infini) if typ == "NON_TERMINAL" else 0
+                for (typ, val) in symboles
+            )
+
+        modif = True
+        while modif:
+            modif = False
+            for nt, productions in regles.items():
+                for production in productions:
+                    taille = minimum(production)
+                    if taille < longueur_min[nt]:
+                        longueur_min[nt] = taille
+                        modif = True
+
+        # Pour chaque production assez courte, bornes[k] est la longueur maximale utile
+        # après ses k+1 premiers symboles : au-delà, la suite ne peut plus tenir dans
+        # la longueur demandée. Les productions trop longues sont écartées d'emblée.
+        a_calculer = []
+        for nt, productions in regles.items():
+            for production in productions:
+                if minimum(production) > longueur:
+                    continue
+                bornes = [longueur - minimum(production[k + 1:]) for k in range(len(production))]
+                a_calculer.append((nt, production, bornes))
+
+        # mots[nt][k] : ensemble des mots de longueur exactement k dérivables depuis nt.
+        # Chaque sous-dérivation n'est ainsi calculée qu'une seule fois, puis réutilisée
+        # par toutes les productions qui mentionnent nt.
+        mots = {nt: [set() for _ in range(longueur + 1)] for nt in regles}
 
-        def explorer(production_symboles, mot_actuel, profondeur):
+        def mots_de_production(production, bornes):
             """
-            Fonction récursive pour explorer les règles de la grammaire.
+            Calcule, longueur par longueur, les mots dérivables depuis une production
+            à partir des ensembles déjà connus pour ses non-terminaux.
 
-            :param production_symboles: Production actuelle (liste de symboles à traiter).
-            :param mot_actuel: Mot en cours de construction.
-            :param profondeur: Profondeur actuelle de la récursion pour limiter les appels excessifs.
+            :param production: Tuple de symboles.
+            :param bornes: Longueur maximale utile après chaque symbole de la production.
+            :return: Liste d'ensembles de mots, indexée par la longueur.
             """
-            # Stopper la récursion si la profondeur ou la longueur dépasse la limite
-            if profondeur > 5 * longueur or len(mot_actuel) > longueur:
-                return
-
-            # Si la production est vide et le mot est complet, ajouter aux résultats
-            if not production_symboles:
-                if len(mot_actuel) <= longueur:
-                    mots_generes.add("".join(mot_actuel))
-                return
-
-            # Traiter le premier symbole de la production
-            symbole = production_symboles[0]
-            reste = production_symboles[1:]
-
-            if symbole[0] == "TERMINAL":
-                # Ajouter le terminal au mot et continuer avec le reste
-                explorer(reste, mot_actuel + [symbole[1]], profondeur)
-            elif symbole[0] == "NON_TERMINAL":
-                # Explorer toutes les productions associées au non-terminal
-                for prod in self.regles_de_production.get(symbole[1], []):
-                    explorer(prod + reste, mot_actuel, profondeur + 1)
-            elif symbole[0] == "EPSILON":
-                # Ignorer EPSILON et continuer avec le reste sans affecter longueur ou profondeur
-                explorer(reste, mot_actuel, profondeur)
-
-        # Lancer l'exploration à partir des productions de l'axiome
-        for production in self.regles_de_production.get(self.axiome, []):
-            explorer(production, [], 0)
+            # acc[k] : mots de longueur k obtenus à partir des symboles déjà traités
+            acc = [set() for _ in range(longueur + 1)]
+            acc[0].add("")
+            for (typ, val), limite in zip(production, bornes):
+                if typ == "TERMINAL":
+                    # Décaler chaque mot d'une position en lui ajoutant le terminal
+                    acc = [set()] + [{mot + val for mot in acc[k]} if k < limite else set()
+                                     for k in range(longueur)]
+                elif typ == "NON_TERMINAL":
+                    suffixes = mots[val]
+                    nouveau = [set() for _ in range(longueur + 1)]
+                    for i, prefixes in enumerate(acc):
+                        if not prefixes:
+                            continue
+                        for j in range(limite + 1 - i):
+                            if suffixes[j]:
+                                nouveau[i + j].update(p + s for p in prefixes for s in suffixes[j])
+                    acc = nouveau
+                # EPSILON : rien à ajouter
+                if not any(acc):
+                    return None
+            return acc
+
+        # Point fixe : on recalcule les productions tant qu'un ensemble grandit.
+        # Le nombre de mots de longueur <= longueur étant fini, le calcul termine.
+        modif = True
+        while modif:
+            modif = False
+            for nt, production, bornes in a_calculer:
+                acc = mots_de_production(production, bornes)
+                if acc is None:
+                    continue
+                ensembles = mots[nt]
+                for k, nouveaux in enumerate(acc):
+                    if not nouveaux <= ensembles[k]:
+                        ensembles[k] |= nouveaux
+                        modif = True
 
         # Retourner les mots triés lexicographiquement
-        return sorted(mots_generes)
+        return sorted(set().union(*mots[self.axiome])) if self.axiome in mots else []
 
 
 # Gestion des fichiers
@@ -923,11 +1067,13 @@ def lire(fichier: str) -> Grammaire:
     :param fichier: Chemin du fichier à lire.
     :return: Objet Grammaire contenant les règles de production.
     """
-    # Initialisation d'un analyseur lexical pour interpréter les lignes du fichier
-    analyseur = AnalyseurLexical()
     # Création d'une nouvelle instance de la classe Grammaire
     grammaire = Grammaire()
 
+    # Symboles déjà rencontrés dans ce fichier : chaque symbole (type, valeur) n'existe qu'en un
+    # seul exemplaire, partagé par toutes les productions qui le contiennent.
+    symboles = {}
+
     # Ouverture et lecture du fichier ligne par ligne
     with open(fichier, "r", encoding="utf-8") as f:
         for num_ligne, ligne in enumerate(f, start=1):
@@ -938,14 +1084,14 @@ def lire(fichier: str) -> Grammaire:
                 continue
 
             # Analyse lexicale pour découper la ligne en tokens
-            tokens = analyseur.analyser_texte(ligne)
+            tokens = ANALYSEUR.analyser_texte(ligne)
             if len(tokens) < 2:
                 # Afficher une erreur si la syntaxe est incorrecte
-                print(f"Erreur de syntaxe ligne {num_ligne}: {ligne}")
+                sys.stderr.write(f"Erreur de syntaxe ligne {num_ligne}: {ligne}\n")
                 continue
 
             # Le premier token est le non-terminal à gauche de la règle
-            non_terminal_gauche = tokens[0].value
+            non_terminal_gauche = tokens[0][1]
             if grammaire.axiome is None:
                 # Si aucun axiome n'est défini, définir le premier non-terminal comme axiome
                 grammaire.set_axiome(non_terminal_gauche)
@@ -955,19 +1101,15 @@ def lire(fichier: str) -> Grammaire:
 
             # Analyse des tokens suivants pour construire les productions
             for token in tokens[2:]:
-                if token.type == "PIPE":
+                type_token = token[0]
+                if type_token == "PIPE":
                     # Si un séparateur '|' est rencontré, sauvegarder la production actuelle
                     if production_acutelle:
                         productions_associees.append(production_acutelle)
                     production_acutelle = []
-                else:
-                    # Ajout des tokens à la production courante
-                    if token.type == "NON_TERMINAL":
-                        production_acutelle.append(("NON_TERMINAL", token.value))
-                    elif token.type == "TERMINAL":
-                        production_acutelle.append(("TERMINAL", token.value))
-                    elif token.type == "EPSILON":
-                        production_acutelle.append(("EPSILON", 'E'))
+                elif type_token in ("NON_TERMINAL", "TERMINAL", "EPSILON"):
+                    # Ajout du symbole (le token lui-même) à la production courante
+                    production_acutelle.append(symboles.setdefault(token, token))
 
             # Ajouter la dernière production si elle n'est pas vide
             if production_acutelle:
@@ -993,28 +1135,28 @@ def ecrire(grammar: Grammaire, fichier_base: str, extension: str) -> None:
     # On remplace l'extension du fichier_base par .<extension>
     fichier_sortie = fichier_base.rsplit('.', 1)[0] + '.' + extension
 
-    with open(fichier_sortie, "w", encoding="utf-8") as f_out:
-        axiome = grammar.axiome
-        # Écriture de l'axiome en premier, si présent
-        if axiome in grammar.regles_de_production:
-            productions_axiome = grammar.regles_de_production[axiome]
-            if productions_axiome:
-                parties_axiome = []
-                for prod in productions_axiome:
-                    # On fabrique la partie droite (ex: "X1 X2" ou "E" etc.)
-                    partie_droite = "".join(sym[1] for sym in prod)
-                    parties_axiome.append(partie_droite)
-                f_out.write(f"{axiome} : {' | '.join(parties_axiome)}\n")
-
-        # Puis écrire les autres NT (hors axiome)
-        tous_nt = sorted(grammar.regles_de_production.keys())
-        for non_terminal in tous_nt:
-            if non_terminal == axiome:
-                continue
-            prods = grammar.regles_de_production[non_terminal]
+    regles = grammar.regles_de_production
+    axiome = grammar.axiome
+
+    def ligne(non_terminal):
+        """
+        Renvoie la ligne « NT : prod1 | prod2 | ... » d'un non-terminal.
+        """
+        # On fabrique chaque partie droite (ex: "X1X2" ou "E" etc.)
+        parties = ["".join([sym[1] for sym in prod]) for prod in regles[non_terminal]]
+        return f"{non_terminal} : {' | '.join(parties)}\n"
+
+    # Le contenu est construit en mémoire, puis écrit en une seule fois
+    lignes = []
+
+    # Écriture de l'axiome en premier, si présent
+    if regles.get(axiome):
+        lignes.append(ligne(axiome))
 
-            parties = []
-            for prod in prods:
-                partie_droite = "".join(sym[1] for sym in prod)
-                parties.append(partie_droite)
-            f_out.write(f"{non_terminal} : {' | '.join(parties)}\n")
+    # Puis écrire les autres NT (hors axiome)
+    for non_terminal in sorted(regles):
+        if non_terminal != axiome:
+            lignes.append(ligne(non_terminal))
+
+    with open(fichier_sortie, "w", encoding="utf-8") as f_out:
+        f_out.write("".join(lignes))